@@ -1,3 +1,5 @@
 from ecs.component import *
-from ecs.entities_manager import Entity, EntitiesManager
+from ecs.entities_manager import Entity, EntitiesManager, EntitiesView, ComponentsView
+from ecs.aabb_tree import AABBTree
 from ecs.systems import *
+from ecs.replay import KeysState, InputRecorder, InputReplayer, ReplayLogError, ReplayDivergenceError
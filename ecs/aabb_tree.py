@@ -0,0 +1,239 @@
+from typing import List, Optional, Tuple
+import pygame
+from ecs.entities_manager import Entity
+
+
+DEFAULT_MARGIN = 8
+
+
+class AABBTree:
+    """  A dynamic bounding volume hierarchy of entities composed of a GraphicComponent, in which every internal node's
+         axis aligned bounding box (AABB) bounds both its children. Leaves store an AABB fattened by margin pixels on
+         each side, hence an entity which moves only a little needs no restructuring of the tree, and the tree is kept
+         balanced by rotations as leaves come and go. Queries therefore visit a number of nodes which is logarithmic in
+         the number of entities, rather than testing every entity.
+         The tree does not observe the EntitiesManager, entities must be inserted into and removed from it explicitly,
+         and update must be called for entities which moved. """
+
+    def __init__(self, margin: int = DEFAULT_MARGIN) -> None:
+        self.__margin = margin
+        self.__root = None                 # Optional[_Node]
+        self.__entity_id_to_leaf = dict()  # Dict[int, _Node]
+
+    def __len__(self) -> int:
+        return len(self.__entity_id_to_leaf)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return id(entity) in self.__entity_id_to_leaf
+
+    def insert(self, entity: Entity) -> None:
+        if id(entity) in self.__entity_id_to_leaf:
+            raise ValueError("Entity is already in the tree.")
+        leaf = _Node(self.__fatten(entity["GraphicComponent"].rect), entity)
+        self.__entity_id_to_leaf[id(entity)] = leaf
+        self.__insert_leaf(leaf)
+
+    def remove(self, entity: Entity) -> None:
+        self.__remove_leaf(self.__entity_id_to_leaf.pop(id(entity)))
+
+    def update(self, entity: Entity) -> bool:
+        """  Refits the tree to the entity's current rect. Returns whether the entity moved out of its fattened AABB,
+             which is the only case in which the tree changes. """
+        leaf = self.__entity_id_to_leaf[id(entity)]
+        rect = entity["GraphicComponent"].rect
+        if leaf.aabb.contains(rect):
+            return False
+        self.__remove_leaf(leaf)
+        leaf.aabb = self.__fatten(rect)
+        self.__insert_leaf(leaf)
+        return True
+
+    def query(self, rect: pygame.Rect) -> List[Entity]:
+        """  Returns the entities whose rects collide with rect, as pygame.Rect.colliderect decides. """
+        colliding_entities = list()
+        stack = [self.__root] if self.__root is not None else list()
+        while stack:
+            node = stack.pop()
+            if not node.aabb.colliderect(rect):
+                continue
+            if node.entity is not None:
+                if node.entity["GraphicComponent"].rect.colliderect(rect):
+                    colliding_entities.append(node.entity)
+            else:
+                stack.append(node.child1)
+                stack.append(node.child2)
+        return colliding_entities
+
+    def ray_cast(self, start: Tuple[float, float], end: Tuple[float, float]) -> List[Entity]:
+        """  Returns the entities whose rects intersect the segment from start to end, ordered by their distance
+             from start. """
+        hits = list()
+        stack = [self.__root] if self.__root is not None else list()
+        while stack:
+            node = stack.pop()
+            if _segment_entry_fraction(node.aabb, start, end) is None:
+                continue
+            if node.entity is not None:
+                fraction = _segment_entry_fraction(node.entity["GraphicComponent"].rect, start, end)
+                if fraction is not None:
+                    hits.append((fraction, node.entity))
+            else:
+                stack.append(node.child1)
+                stack.append(node.child2)
+        hits.sort(key=lambda hit: hit[0])
+        return [entity for _, entity in hits]
+
+    def __fatten(self, rect: pygame.Rect) -> pygame.Rect:
+        return rect.inflate(2 * self.__margin, 2 * self.__margin)
+
+    def __insert_leaf(self, leaf: "_Node") -> None:
+        if self.__root is None:
+            self.__root = leaf
+            leaf.parent = None
+            return
+
+        # descend towards the sibling which minimizes the increase in perimeter of the tree's AABBs
+        leaf_aabb = leaf.aabb
+        node = self.__root
+        while node.entity is None:
+            combined_perimeter = _perimeter(node.aabb.union(leaf_aabb))
+            cost = 2 * combined_perimeter
+            inheritance_cost = 2 * (combined_perimeter - _perimeter(node.aabb))
+            child1_cost = _descent_cost(node.child1, leaf_aabb) + inheritance_cost
+            child2_cost = _descent_cost(node.child2, leaf_aabb) + inheritance_cost
+            if cost < child1_cost and cost < child2_cost:
+                break
+            node = node.child1 if child1_cost < child2_cost else node.child2
+
+        sibling = node
+        old_parent = sibling.parent
+        new_parent = _Node(sibling.aabb.union(leaf_aabb))
+        new_parent.parent = old_parent
+        new_parent.height = sibling.height + 1
+        if old_parent is None:
+            self.__root = new_parent
+        elif old_parent.child1 is sibling:
+            old_parent.child1 = new_parent
+        else:
+            old_parent.child2 = new_parent
+        new_parent.child1 = sibling
+        new_parent.child2 = leaf
+        sibling.parent = new_parent
+        leaf.parent = new_parent
+
+        self.__refit_ancestors(new_parent)
+
+    def __remove_leaf(self, leaf: "_Node") -> None:
+        if leaf is self.__root:
+            self.__root = None
+            return
+
+        parent = leaf.parent
+        grandparent = parent.parent
+        sibling = parent.child2 if parent.child1 is leaf else parent.child1
+        leaf.parent = None
+        if grandparent is None:
+            self.__root = sibling
+            sibling.parent = None
+            return
+
+        if grandparent.child1 is parent:
+            grandparent.child1 = sibling
+        else:
+            grandparent.child2 = sibling
+        sibling.parent = grandparent
+        self.__refit_ancestors(grandparent)
+
+    def __refit_ancestors(self, node: Optional["_Node"]) -> None:
+        while node is not None:
+            node = self.__balance(node)
+            node.height = 1 + max(node.child1.height, node.child2.height)
+            node.aabb = node.child1.aabb.union(node.child2.aabb)
+            node = node.parent
+
+    def __balance(self, a: "_Node") -> "_Node":
+        """  If the heights of a's subtrees differ by more than one, rotates the higher child up. Returns the root of
+             the subtree. """
+        if a.entity is not None or a.height < 2:
+            return a
+
+        b, c = a.child1, a.child2
+        balance = c.height - b.height
+        if balance > 1:
+            self.__rotate_up(a, c, b, is_rising_child1=False)
+            return c
+        if balance < -1:
+            self.__rotate_up(a, b, c, is_rising_child1=True)
+            return b
+        return a
+
+    def __rotate_up(self, a: "_Node", rising: "_Node", other: "_Node", is_rising_child1: bool) -> None:
+        """  Swaps a with its child rising, such that rising's higher child remains under rising, and its lower child
+             replaces rising under a. """
+        f, g = rising.child1, rising.child2
+        higher, lower = (f, g) if f.height > g.height else (g, f)
+
+        rising.child1 = a
+        rising.parent = a.parent
+        a.parent = rising
+        if rising.parent is None:
+            self.__root = rising
+        elif rising.parent.child1 is a:
+            rising.parent.child1 = rising
+        else:
+            rising.parent.child2 = rising
+
+        rising.child2 = higher
+        if is_rising_child1:
+            a.child1 = lower
+        else:
+            a.child2 = lower
+        lower.parent = a
+
+        a.aabb = other.aabb.union(lower.aabb)
+        rising.aabb = a.aabb.union(higher.aabb)
+        a.height = 1 + max(other.height, lower.height)
+        rising.height = 1 + max(a.height, higher.height)
+
+
+class _Node:
+    __slots__ = ("aabb", "entity", "parent", "child1", "child2", "height")
+
+    def __init__(self, aabb: pygame.Rect, entity: Entity = None) -> None:
+        self.aabb = aabb
+        self.entity = entity    # None for internal nodes
+        self.parent = None
+        self.child1 = None
+        self.child2 = None
+        self.height = 0         # leaves are of height 0
+
+
+def _perimeter(rect: pygame.Rect) -> int:
+    return 2 * (rect.width + rect.height)
+
+
+def _descent_cost(child: _Node, leaf_aabb: pygame.Rect) -> int:
+    combined_perimeter = _perimeter(child.aabb.union(leaf_aabb))
+    if child.entity is not None:
+        return combined_perimeter
+    return combined_perimeter - _perimeter(child.aabb)
+
+
+def _segment_entry_fraction(rect: pygame.Rect, start: Tuple[float, float], end: Tuple[float, float]) \
+        -> Optional[float]:
+    """  Returns the fraction of the segment from start to end at which it enters rect, or None if it misses rect. """
+    min_fraction, max_fraction = 0.0, 1.0
+    for origin, delta, low, high in ((start[0], end[0] - start[0], rect.left, rect.right),
+                                     (start[1], end[1] - start[1], rect.top, rect.bottom)):
+        if delta == 0:
+            if origin < low or high <= origin:
+                return None
+            continue
+        near, far = (low - origin) / delta, (high - origin) / delta
+        if near > far:
+            near, far = far, near
+        min_fraction = max(min_fraction, near)
+        max_fraction = min(max_fraction, far)
+        if min_fraction > max_fraction:
+            return None
+    return min_fraction
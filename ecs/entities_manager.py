@@ -1,5 +1,6 @@
-from typing import Any, Iterator, Dict
+from typing import Any, Iterator, Dict, List, Sequence
 from collections import OrderedDict
+from operator import itemgetter
 
 
 Entity = Dict[str, Any]
@@ -63,23 +64,72 @@ class EntitiesManager:
                 groups.add(group_name)
         return groups
 
-    def get_all_entities_of_group(self, group_name: Any) -> Iterator[Entity]:
-        def group_entities_generator() -> Iterator[Entity]:
-            for entity in self.__group_to_entities[group_name]:
-                yield entity
-        return group_entities_generator()
-
-    def get_all_entities_with_component_class(self, compo_class_name: str) -> Iterator[Entity]:
-        def compo_entities_generator() -> Iterator[Entity]:
-            for entity in self.__compo_class_name_to_entities[compo_class_name]:
-                yield entity
-        return compo_entities_generator()
-
-    def get_all_instances_of_component_class(self, compo_class_name: str) -> Iterator[Any]:
-        def compo_instances_generator() -> Iterator[Any]:
-            for entity in self.__compo_class_name_to_entities[compo_class_name]:
-                yield entity[compo_class_name]
-        return compo_instances_generator()
+    def get_all_entities_of_group(self, group_name: Any) -> "EntitiesView":
+        return EntitiesView(self.__group_to_entities[group_name])
+
+    def get_all_entities_with_component_class(self, compo_class_name: str) -> "EntitiesView":
+        return EntitiesView(self.__compo_class_name_to_entities[compo_class_name])
+
+    def get_all_instances_of_component_class(self, compo_class_name: str) -> "ComponentsView":
+        return ComponentsView(self.__compo_class_name_to_entities[compo_class_name], compo_class_name)
+
+
+class EntitiesView(Sequence):
+    """  A read-only view of a list of entities stored by an EntitiesManager. The view does not copy the list, it
+         reflects it as it is when read. Iterating the view is safe as long as the underlying group (or component
+         class) is not modified meanwhile. A system which might register, unregister or discharge entities while
+         iterating (e.g. an off bounds handler) should iterate a copy instead, taken with list(view) or view[:]. """
+    __slots__ = ("_entities",)
+
+    def __init__(self, entities: List[Entity]) -> None:
+        self._entities = entities
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __getitem__(self, idx):
+        return self._entities[idx]
+
+    def __iter__(self) -> Iterator[Entity]:
+        return iter(self._entities)
+
+    def __contains__(self, entity: Any) -> bool:
+        return entity in self._entities
+
+    def chunks(self, chunk_size: int) -> Iterator[List[Entity]]:
+        """  Yields consecutive lists of at most chunk_size entities, each taken when it is reached. """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive.")
+        for start in range(0, len(self._entities), chunk_size):
+            yield self._entities[start:start + chunk_size]
+
+
+class ComponentsView(Sequence):
+    """  A read-only view of the instances of a single component class, as stored by an EntitiesManager.
+         Same as EntitiesView, the view does not copy the underlying list of entities. """
+    __slots__ = ("_entities", "_compo_class_name")
+
+    def __init__(self, entities: List[Entity], compo_class_name: str) -> None:
+        self._entities = entities
+        self._compo_class_name = compo_class_name
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return list(map(itemgetter(self._compo_class_name), self._entities[idx]))
+        return self._entities[idx][self._compo_class_name]
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(itemgetter(self._compo_class_name), self._entities)
+
+    def chunks(self, chunk_size: int) -> Iterator[List[Any]]:
+        """  Yields consecutive lists of at most chunk_size component instances, each taken when it is reached. """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive.")
+        for start in range(0, len(self._entities), chunk_size):
+            yield self[start:start + chunk_size]
 
 
 class OccupiedNameError(LookupError):
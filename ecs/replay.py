@@ -0,0 +1,116 @@
+from typing import Any, Dict, Iterable, List, Sequence
+from random import Random, randrange
+import json
+
+
+LOG_FORMAT_VERSION = 1
+MAX_SEED = 2 ** 32
+
+
+class KeysState:
+    """  A stand in for the sequence returned by pygame.key.get_pressed(). Keys which were not recorded are never
+         pressed. """
+    __slots__ = ("_pressed_keys",)
+
+    def __init__(self, pressed_keys: Iterable[int]) -> None:
+        self._pressed_keys = frozenset(pressed_keys)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self._pressed_keys
+
+
+class InputRecorder:
+    """  Records, frame by frame, the state of the given keys, alongside the seed of a random number generator.
+         Frames are stored as bit masks of the pressed keys, run-length encoded, so that an idle player costs a
+         single entry. Optionally, every frame may also be followed by a checkpoint (e.g. entities counts), which
+         lets a later replay verify it did not diverge from the recorded run. """
+
+    def __init__(self, keys: Sequence[int], seed: int = None) -> None:
+        self.seed = randrange(MAX_SEED) if seed is None else seed
+        self.rng = Random(self.seed)
+        self.__keys = tuple(keys)
+        self.__frames = list()         # List[List[int]], i.e. [keys mask, repeat count]
+        self.__checkpoints = list()    # List[List[Any]], i.e. [checkpoint, repeat count]
+
+    def record_frame(self, keys_state: Any) -> None:
+        mask = 0
+        for bit, key in enumerate(self.__keys):
+            if keys_state[key]:
+                mask |= 1 << bit
+        _append_run_length_encoded(self.__frames, mask)
+
+    def record_checkpoint(self, checkpoint: Sequence[Any]) -> None:
+        _append_run_length_encoded(self.__checkpoints, list(checkpoint))
+
+    def get_log(self) -> Dict[str, Any]:
+        return {"version": LOG_FORMAT_VERSION,
+                "seed": self.seed,
+                "keys": list(self.__keys),
+                "frames": [list(run) for run in self.__frames],
+                "checkpoints": [list(run) for run in self.__checkpoints]}
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as log_file:
+            json.dump(self.get_log(), log_file, separators=(",", ":"))
+
+
+class InputReplayer:
+    """  Replays a log made by an InputRecorder. rng is seeded identically to the recorder's, hence as long as the
+         game draws its random numbers only from rng, and in the same order, the replay reproduces the recorded run. """
+
+    def __init__(self, log: Dict[str, Any]) -> None:
+        if log.get("version") != LOG_FORMAT_VERSION:
+            raise ReplayLogError("Unsupported replay log version: {}.".format(log.get("version")))
+        self.seed = log["seed"]
+        self.rng = Random(self.seed)
+        self.__keys = tuple(log["keys"])
+        self.__frames = _decode_run_length_encoding(log["frames"])
+        self.__checkpoints = _decode_run_length_encoding(log["checkpoints"])
+        self.__curr_frame = 0
+
+    @classmethod
+    def load(cls, path: str) -> "InputReplayer":
+        with open(path, "r") as log_file:
+            return cls(json.load(log_file))
+
+    def __len__(self) -> int:
+        return len(self.__frames)
+
+    def has_next_frame(self) -> bool:
+        return self.__curr_frame < len(self.__frames)
+
+    def next_frame(self) -> KeysState:
+        mask = self.__frames[self.__curr_frame]
+        self.__curr_frame += 1
+        return KeysState(key for bit, key in enumerate(self.__keys) if mask & (1 << bit))
+
+    def verify_checkpoint(self, checkpoint: Sequence[Any]) -> None:
+        """  Compares checkpoint with the one recorded for the last frame returned by next_frame. """
+        frame_idx = self.__curr_frame - 1
+        if frame_idx < len(self.__checkpoints) and self.__checkpoints[frame_idx] != list(checkpoint):
+            raise ReplayDivergenceError(frame_idx, self.__checkpoints[frame_idx], list(checkpoint))
+
+
+def _append_run_length_encoded(runs: List[List[Any]], value: Any) -> None:
+    if runs and runs[-1][0] == value:
+        runs[-1][1] += 1
+    else:
+        runs.append([value, 1])
+
+
+def _decode_run_length_encoding(runs: Iterable[Sequence[Any]]) -> List[Any]:
+    values = list()
+    for value, repeat in runs:
+        values.extend([value] * repeat)
+    return values
+
+
+class ReplayLogError(ValueError):
+    def __init__(self, message: str):
+        super(ReplayLogError, self).__init__(message)
+
+
+class ReplayDivergenceError(RuntimeError):
+    def __init__(self, frame_idx: int, expected: Any, actual: Any):
+        super(ReplayDivergenceError, self).__init__("Replay diverged at frame {}: expected {}, got {}."
+                                                    .format(frame_idx, expected, actual))
@@ -2,6 +2,7 @@ from typing import Iterable, List, Callable, Dict
 import pygame
 from ecs.component import GraphicComponent, LEFT_DIRECTION, RIGHT_DIRECTION
 from ecs.entities_manager import Entity, EntitiesManager
+from ecs.aabb_tree import AABBTree
 
 
 NO_COLLISIONS = -1
@@ -123,6 +124,31 @@ def lists_collision_detection_with_handling_system(entities: List[Entity],
             handler(entity, other_entities, collision_indices, entities_manager)
 
 
+def aabb_tree_update_system(entities: Iterable[Entity], aabb_tree: AABBTree) -> None:
+    """  Refits the tree to entities which might have moved, e.g. after move_system. Entities which stayed inside their
+         fattened bounding boxes cost a single containment test each. """
+    for entity in entities:
+        aabb_tree.update(entity)
+
+
+def aabb_tree_collision_detection_system(entity: Entity, aabb_tree: AABBTree) -> List[Entity]:
+    """  Returns the entities of the tree, other than entity itself, with which entity collides. """
+    entity_rect = entity["GraphicComponent"].rect
+    return [other_entity for other_entity in aabb_tree.query(entity_rect) if other_entity is not entity]
+
+
+def aabb_tree_collision_detection_with_handling_system(entity: Entity, aabb_tree: AABBTree,
+                                                       entities_manager: EntitiesManager,
+                                                       handler: Callable[[Iterable[Entity], int, EntitiesManager],
+                                                                         None]) -> None:
+    """  Same as collision_detection_with_handling_system, only the entities to collide with are looked up in the tree.
+         The handler receives the list of colliding entities, and the index of the first of them. A handler which
+         unregisters entities should remove them from the tree as well. """
+    colliding_entities = aabb_tree_collision_detection_system(entity, aabb_tree)
+    if colliding_entities:
+        handler(colliding_entities, 0, entities_manager)
+
+
 def decrease_lifetime_system(entities_composed_of_lifetime_compo: Iterable[Entity],
                              entities_manager: EntitiesManager) -> None:
     for entity in entities_composed_of_lifetime_compo:
@@ -1,8 +1,10 @@
 from sys import stderr
-from typing import List, Tuple, Callable, Iterable
+from typing import Any, List, Tuple, Callable, Iterable, Optional, Sequence
 from enum import IntEnum, unique
-from random import random
+from random import Random
 from threading import Thread
+from argparse import ArgumentParser
+import os
 import pygame
 import ecs
 
@@ -40,9 +42,39 @@ BOMB_EDGE_OFFSET = 50
 EXPLOSION_LIFE_TIME = 6
 ALIEN_ANIMATION_INTERVAL_LENGTH = 12
 FADEOUT_TIME = 1000
+UNLIMITED_FRAME_RATE = 0
+RECORDED_KEYS = pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE
+
+
+def run_aliens_game(path_to_resources: str, record_path: str = None, replay_path: str = None, seed: int = None,
+                    headless: bool = False) -> None:
+    """  Runs the game. If record_path is given, the player's input and the seed of the random number generator are
+         saved to it once the game is over. If replay_path is given, a recorded game is replayed instead of reading
+         the player's input. A headless replay uses SDL's dummy drivers and does not limit the frame rate, which
+         makes it a repeatable load trace for benchmarks and profiling. """
+    if replay_path is not None and (record_path is not None or seed is not None):
+        raise ValueError("A replay can be neither recorded nor seeded.")
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    recorder = None
+    if replay_path is not None:
+        replayer = ecs.InputReplayer.load(replay_path)
+        rng = replayer.rng
+        input_source = get_replay_input_source(replayer)
+        checkpoint_handler = replayer.verify_checkpoint
+    elif record_path is not None:
+        recorder = ecs.InputRecorder(RECORDED_KEYS, seed)
+        rng = recorder.rng
+        input_source = get_live_input_source(recorder)
+        checkpoint_handler = recorder.record_checkpoint
+    else:
+        rng = Random(seed)
+        input_source = get_live_input_source(None)
+        checkpoint_handler = None
+    frames_per_second = UNLIMITED_FRAME_RATE if headless else FRAMES_PER_SECOND
 
-
-def run_aliens_game(path_to_resources: str) -> None:
     pygame.init()
     screen = pygame.display.set_mode(RESOLUTION)
     screen_rect = screen.get_rect()
@@ -58,10 +90,14 @@ def run_aliens_game(path_to_resources: str) -> None:
     afv, lives, score = dict(), dict(), dict()
     add_groups_and_create_entities(images, entities_manger, afv, lives, score)
 
-    game_loop(screen, background, images, sounds, entities_manger, afv, lives, score)
+    game_loop(screen, background, images, sounds, entities_manger, afv, lives, score, rng, input_source,
+              frames_per_second, checkpoint_handler)
 
     pygame.quit()
 
+    if recorder is not None:
+        recorder.save(record_path)
+
 
 @unique
 class ImgsIndices(IntEnum):
@@ -169,7 +205,11 @@ def register_score(entities_manager: ecs.EntitiesManager, score: ecs.Entity) ->
 
 def game_loop(screen: pygame.Surface, background: pygame.Surface, images: List[pygame.Surface],
               sounds: List[pygame.mixer.Sound], entities_manager: ecs.EntitiesManager, afv: ecs.Entity,
-              lives: ecs.Entity, score: ecs.Entity) -> None:
+              lives: ecs.Entity, score: ecs.Entity, rng: Random, input_source: Callable[[], Optional[Any]],
+              frames_per_second: int = FRAMES_PER_SECOND,
+              checkpoint_handler: Callable[[Sequence[int]], None] = None) -> None:
+    """  input_source is called once per frame and returns the keys state for that frame, or None once the game should
+         quit. All random decisions are drawn from rng, so that a game is reproducible given its seed and input. """
     alien_factory = get_aliens_factory(images[ImgsIndices.alien1], (images[ImgsIndices.alien1],
                                                                     images[ImgsIndices.alien2],
                                                                     images[ImgsIndices.alien3]), entities_manager)
@@ -204,9 +244,8 @@ def game_loop(screen: pygame.Surface, background: pygame.Surface, images: List[p
     clock = pygame.time.Clock()
 
     while curr_life[0] > 0:
-        pygame.event.pump()
-        keys_state = pygame.key.get_pressed()
-        if keys_state[pygame.K_ESCAPE] or pygame.event.peek(pygame.QUIT):
+        keys_state = input_source()
+        if keys_state is None:
             break
 
         ecs.erase_system(screen, background,
@@ -217,11 +256,11 @@ def game_loop(screen: pygame.Surface, background: pygame.Surface, images: List[p
                                              args=(explosions_list, entities_manager))
         explosions_lifetime_handler.start()
 
-        if random() < ALIEN_INSTANTIATION_PROBABILITY:
+        if rng.random() < ALIEN_INSTANTIATION_PROBABILITY:
             alien_factory(ALIEN_INITIAL_POSITION[0], ALIEN_INITIAL_POSITION[1])
         aliens_list = list(entities_manager.get_all_entities_of_group("aliens"))
 
-        if aliens_list and random() < BOMB_INSTANTIATION_PROBABILITY:
+        if aliens_list and rng.random() < BOMB_INSTANTIATION_PROBABILITY:
             last_alien_rect = aliens_list[-1]["GraphicComponent"].rect
             if 0 < last_alien_rect.left and last_alien_rect.right < right_edge:
                 bomb_initial_x, bomb_initial_y = last_alien_rect.move(BOMB_OFFSET[0], BOMB_OFFSET[1]).midbottom
@@ -259,13 +298,15 @@ def game_loop(screen: pygame.Surface, background: pygame.Surface, images: List[p
                                            args=(shots_list, aliens_list, entities_manager,
                                                  shot_at_aliens_handler))
         aliens_collisions_handler.start()
+        # the AFV handler checks whether the entity it hit is still an alien, hence it must run after the shots
+        # handler, otherwise a replay might not reproduce the recorded game
+        aliens_collisions_handler.join()
 
         afv_collision_handler = Thread(target=ecs.collision_detection_with_handling_system,
                                        args=(afv, bombs_list + aliens_list, entities_manager,
                                              handle_afv_collision))
         afv_collision_handler.start()
 
-        aliens_collisions_handler.join()
         afv_collision_handler.join()
         explosions_lifetime_handler.join()
 
@@ -273,10 +314,39 @@ def game_loop(screen: pygame.Surface, background: pygame.Surface, images: List[p
 
         pygame.display.update(dirty_rects)
         dirty_rects.clear()
-        clock.tick(FRAMES_PER_SECOND)
 
-    pygame.mixer.fadeout(FADEOUT_TIME)
-    pygame.time.wait(FADEOUT_TIME)
+        if checkpoint_handler is not None:
+            checkpoint_handler((len(entities_manager.get_all_entities_of_group("aliens")),
+                                len(entities_manager.get_all_entities_of_group("bombs")),
+                                len(entities_manager.get_all_entities_of_group("shots")),
+                                len(entities_manager.get_all_entities_of_group("explosions")),
+                                curr_score[0], curr_life[0]))
+        clock.tick(frames_per_second)
+
+    if frames_per_second != UNLIMITED_FRAME_RATE:
+        pygame.mixer.fadeout(FADEOUT_TIME)
+        pygame.time.wait(FADEOUT_TIME)
+
+
+def get_live_input_source(recorder: ecs.InputRecorder = None) -> Callable[[], Optional[Any]]:
+    def live_input_source() -> Optional[Any]:
+        pygame.event.pump()
+        keys_state = pygame.key.get_pressed()
+        if keys_state[pygame.K_ESCAPE] or pygame.event.peek(pygame.QUIT):
+            return None
+        if recorder is not None:
+            recorder.record_frame(keys_state)
+        return keys_state
+    return live_input_source
+
+
+def get_replay_input_source(replayer: ecs.InputReplayer) -> Callable[[], Optional[ecs.KeysState]]:
+    def replay_input_source() -> Optional[ecs.KeysState]:
+        pygame.event.pump()
+        if not replayer.has_next_frame() or pygame.event.peek(pygame.QUIT):
+            return None
+        return replayer.next_frame()
+    return replay_input_source
 
 
 def get_aliens_factory(alien_surface: pygame.Surface, cyc_surfaces: Tuple[pygame.Surface, ...],
@@ -400,4 +470,16 @@ def get_shot_at_aliens_handler(explosions_factory: Callable[[int, int], ecs.Enti
 
 
 if __name__ == '__main__':
-    run_aliens_game("aliens_game_resources/")
+    arg_parser = ArgumentParser(description=SCREEN_CAPTION)
+    arg_parser.add_argument("--record", metavar="PATH", help="save the game's input and seed to PATH")
+    arg_parser.add_argument("--replay", metavar="PATH", help="replay a game recorded to PATH")
+    arg_parser.add_argument("--seed", type=int, help="seed of the random number generator")
+    arg_parser.add_argument("--headless", action="store_true", help="replay without display, sound or frame limit")
+    args = arg_parser.parse_args()
+    if args.headless and args.replay is None:
+        arg_parser.error("--headless requires --replay")
+    if args.replay is not None and args.record is not None:
+        arg_parser.error("--replay cannot be combined with --record")
+    if args.replay is not None and args.seed is not None:
+        arg_parser.error("--replay cannot be combined with --seed, the replay uses its recorded seed")
+    run_aliens_game("aliens_game_resources/", args.record, args.replay, args.seed, args.headless)